@@ -0,0 +1,81 @@
+"""
+Line scoring for GeneralizedTicTacToe's heuristic evaluation.
+
+The score of a line depends only on how many symbols each side has in it,
+so it is tabulated once and looked up when a move changes a line's counts.
+"""
+from typing import List, Tuple
+
+
+def pattern_values(win_length: int, win_score: int) -> List[int]:
+    """
+    Tabulate the heuristic value of a line for every pair of symbol counts.
+    
+    Args:
+        win_length: Number of consecutive symbols needed to win
+        win_score: Score of a completed line
+        
+    Returns:
+        Flat list indexed by player_count * (win_length + 1) + computer_count.
+        Positive scores favour the player, negative scores favour the computer
+    """
+    values = []
+    for player_count in range(win_length + 1):
+        for computer_count in range(win_length + 1):
+            if player_count and computer_count:
+                values.append(0)  # Mixed symbols, no potential
+            elif player_count:
+                values.append(win_score if player_count == win_length else 10 ** player_count)
+            elif computer_count:
+                values.append(-win_score if computer_count == win_length else -(10 ** computer_count))
+            else:
+                values.append(0)  # Empty pattern
+    return values
+
+
+def threat_flags(win_length: int) -> bytes:
+    """
+    Tabulate which symbol counts make a line a threat: one side is a single
+    symbol away from completing it and the other side has not blocked it.
+    
+    Args:
+        win_length: Number of consecutive symbols needed to win
+        
+    Returns:
+        Flat table indexed like pattern_values, 1 for a threat and 0 otherwise
+    """
+    flags = bytearray()
+    for player_count in range(win_length + 1):
+        for computer_count in range(win_length + 1):
+            flags.append((player_count == win_length - 1 and computer_count == 0) or
+                         (computer_count == win_length - 1 and player_count == 0))
+    return bytes(flags)
+
+
+def threat_weights(win_length: int) -> Tuple[List[int], List[int]]:
+    """
+    Tabulate how much a line adds to the threat score of a move through it.
+    A line free of the opponent's symbols is worth 10^(own + 1), since the move
+    extends it; a line free of our symbols is worth 10^(opponent), since the
+    move blocks it.
+    
+    Args:
+        win_length: Number of consecutive symbols needed to win
+        
+    Returns:
+        Tuple of (weights when the computer is to move, weights when the player is to move),
+        each a flat table indexed like pattern_values
+    """
+    computer_weights = []
+    player_weights = []
+    for player_count in range(win_length + 1):
+        for computer_count in range(win_length + 1):
+            for own, other, weights in ((player_count, computer_count, player_weights),
+                                        (computer_count, player_count, computer_weights)):
+                weight = 0
+                if other == 0:
+                    weight += 10 ** (own + 1)  # Extends our line (weighted above an equal block)
+                if own == 0:
+                    weight += 10 ** other      # Blocks the opponent's line
+                weights.append(weight)
+    return computer_weights, player_weights
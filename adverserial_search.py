@@ -1,6 +1,12 @@
 from typing import List, Tuple, Set
-from multiprocessing import Process, Pool, cpu_count
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import cpu_count
+import atexit
+import random
+import time
 import api
+from _eval import pattern_values, threat_flags, threat_weights
+from transposition import SharedTranspositionTable
 
 class GeneralizedTicTacToe():
     """
@@ -8,9 +14,30 @@ class GeneralizedTicTacToe():
     with customizable winning conditions. Includes AI using alpha-beta pruning.
     """
 
+    # Fixed attribute layout: no per-instance __dict__, and faster attribute access during search
+    __slots__ = ('COMPUTER', 'PLAYER', 'win_length', 'search_depth', 'depth_limit', 'proximity', 'size',
+                 'grid', 'empty_count', 'bb_player', 'bb_comp', 'line_masks', 'lines_through', 'win_shifts',
+                 'line_p_count', 'line_c_count', 'pattern_values', 'score', 'threat_flags', 'threat_count',
+                 'threat_weights',
+                 'neighbors', 'frontier', 'symmetries', 'player_moves', 'computer_moves', 'zobrist', 'hash', 'tt',
+                 'killers', 'history')
+
     # Constants used in the evaluation process
     CONTINUE = 0x4D4D4D4D  # Special value indicating that the game should continue
     MAX_VALUE = 1000000000  # Large value used for win/loss scoring
+    MAX_EXTENSION = 2  # Extra depth searched past the horizon while a win is one move away
+    POLL_DELAY_MIN = 0.1  # Seconds to wait before polling again for an online opponent's move
+    POLL_DELAY_MAX = 2.0  # Longest wait between polls (the wait doubles after each poll)
+    SYMBOLS = '-XO'  # Display character for empty, player and computer cells
+
+    # Transposition table entry flags
+    EXACT = 0  # Stored value is the exact minimax value
+    LOWER = 1  # Stored value is a lower bound (search failed high)
+    UPPER = 2  # Stored value is an upper bound (search failed low)
+
+    ZOBRIST_SEED = 0x5EED  # Fixed seed so hash keys are reproducible across runs
+    NULL_MOVE_KEY = 0x9E3779B97F4A7C15  # Hashed in while searching after a pass, so those positions get their own entries
+    NULL_MOVE_REDUCTION = 2  # Extra depth skipped when searching after a pass
 
     def __init__(self, size: int, win_length: int):
         """
@@ -20,18 +47,40 @@ class GeneralizedTicTacToe():
             size: The dimension of the square board (size x size)
             win_length: Number of consecutive symbols needed to win
         """
-        self.COMPUTER = 'O'      # Symbol for computer player
-        self.PLAYER = 'X'        # Symbol for human player
+        self.COMPUTER = 2        # Cell value for computer player
+        self.PLAYER = 1          # Cell value for human player
         self.win_length = win_length  # Number of consecutive symbols needed to win
         self.search_depth = 4    # Maximum depth for alpha-beta search
+        self.depth_limit = self.search_depth  # Horizon of the current iterative-deepening pass
         self.proximity = 1       # Radius around existing moves to consider for next moves
         self.size = size         # Board dimension
         self.grid = self.initialize_grid(self.size)  # Initialize empty board
+        self.empty_count = size * size  # Number of empty cells left
+        self.bb_player = 0           # Bitboard of player cells (bit row * size + col)
+        self.bb_comp = 0             # Bitboard of computer cells
+        # Bitmask of every possible winning line, and the indices of the lines through each cell
+        self.line_masks, self.lines_through = self.build_line_masks()
+        self.win_shifts = self.build_win_shifts()  # (bit shift, start mask) for each line direction
+        self.line_p_count = bytearray(len(self.line_masks))  # Player symbols in each line
+        self.line_c_count = bytearray(len(self.line_masks))  # Computer symbols in each line
+        self.pattern_values = pattern_values(self.win_length, GeneralizedTicTacToe.MAX_VALUE)
+        self.score = 0               # Heuristic score of the board, updated move by move
+        self.threat_flags = threat_flags(self.win_length)
+        self.threat_count = 0        # Lines that one side can complete with its next symbol
+        self.threat_weights = threat_weights(self.win_length)  # Move-ordering weight of a line, per side to move
+        self.neighbors = self.find_neighbors(self.proximity)  # Cells within proximity radius of each cell
+        self.frontier = {}           # Empty (row, col) near a stone -> number of stones within radius
+        self.symmetries = self.build_symmetries()  # Cell permutation for each rotation/reflection of the board
         self.player_moves = set()    # Track player move coordinates
         self.computer_moves = set()  # Track computer move coordinates
+        self.zobrist = self.initialize_zobrist(self.size)  # Random keys per (row, col, symbol)
+        self.hash = 0                # Zobrist hash of the current position
+        self.tt = {}                 # Transposition table: hash -> (depth, flag, value, best_move)
+        self.killers = [[] for _ in range(self.search_depth + GeneralizedTicTacToe.MAX_EXTENSION + 1)]  # Up to two cutoff moves per depth
+        self.history = {}            # (row, col) -> how often/deeply the move caused a cutoff
 
     
-    def initialize_grid(self, size: int) -> List[List[str]]:
+    def initialize_grid(self, size: int) -> bytearray:
         """
         Create an empty game board.
         
@@ -39,10 +88,25 @@ class GeneralizedTicTacToe():
             size: The dimension of the square board
         
         Returns:
-            A 2D list representing the empty board with '-' in each cell
+            A flat row-major bytearray with 0 (empty) in each cell;
+            cell (row, col) is at index row * size + col
         """
-        grid = [['-' for _ in range(size)] for _ in range(size)]
-        return grid
+        return bytearray(size * size)
+
+
+    def initialize_zobrist(self, size: int) -> List[List[List[int]]]:
+        """
+        Create the Zobrist keys used to hash board positions.
+        
+        Args:
+            size: The dimension of the square board
+        
+        Returns:
+            A 3D list of random 64-bit ints indexed by [row][col][symbol_idx],
+            where symbol_idx is 0 for the player and 1 for the computer
+        """
+        rng = random.Random(GeneralizedTicTacToe.ZOBRIST_SEED)
+        return [[[rng.getrandbits(64), rng.getrandbits(64)] for _ in range(size)] for _ in range(size)]
 
 
     def is_valid_position(self, row: int, col: int) -> bool:
@@ -56,11 +120,7 @@ class GeneralizedTicTacToe():
         Returns:
             True if the position is within bounds and empty, False otherwise
         """
-        if row >= self.size or row < 0:
-            return False
-        if col >= self.size or col < 0:
-            return False
-        return self.grid[row][col] == '-'
+        return 0 <= row < self.size and 0 <= col < self.size and self.grid[row * self.size + col] == 0
     
 
     def display_grid(self):
@@ -69,7 +129,7 @@ class GeneralizedTicTacToe():
         """
         for i in range(self.size):
             for j in range(self.size):
-                print(self.grid[i][j], end=" ")
+                print(GeneralizedTicTacToe.SYMBOLS[self.grid[i * self.size + j]], end=" ")
             print()
         return
     
@@ -84,7 +144,7 @@ class GeneralizedTicTacToe():
         positions = []
         for i in range(self.size):
             for j in range(self.size):
-                if self.grid[i][j] == '-':
+                if self.grid[i * self.size + j] == 0:
                     positions.append((i, j))
         return positions
     
@@ -93,40 +153,94 @@ class GeneralizedTicTacToe():
         """
         Get empty positions that are within the proximity radius of existing moves.
         This optimizes move generation by focusing on relevant areas of the board.
+        The positions are kept up to date by place_symbol/remove_symbol.
         
         Returns:
             List of (row, col) tuples for empty positions near existing moves,
             or all empty positions if no nearby positions found
         """
-        radius = self.proximity
-        positions = []
-        
-        # Check positions near player moves
-        for move in self.player_moves:
-            start_row = max(move[0] - radius, 0) 
-            end_row = min(move[0] + radius, self.size - 1)  
-            start_col = max(move[1] - radius, 0) 
-            end_col = min(move[1] + radius, self.size - 1)
-            for i in range(start_row, end_row + 1):
-                for j in range(start_col, end_col + 1):
-                    if self.grid[i][j] == '-' and (i, j) not in positions:
-                        positions.append((i, j))
-        
-        # Check positions near computer moves
-        for move in self.computer_moves:
-            start_row = max(move[0] - radius, 0) 
-            end_row = min(move[0] + radius, self.size - 1)  
-            start_col = max(move[1] - radius, 0) 
-            end_col = min(move[1] + radius, self.size - 1)
-            for i in range(start_row, end_row + 1):
-                for j in range(start_col, end_col + 1):
-                    if self.grid[i][j] == '-' and (i, j) not in positions:
-                        positions.append((i, j))
-
         # If no nearby positions found, return all empty positions
-        if not positions:
+        if not self.frontier:
             return self.get_empty_positions()
-        return positions
+        return list(self.frontier)
+
+
+    def find_neighbors(self, radius: int) -> List[List[Tuple]]:
+        """
+        Find the cells surrounding every cell on the board.
+        
+        Args:
+            radius: Distance (in rows and columns) that counts as nearby
+            
+        Returns:
+            List indexed by flat cell index, each a list of ((row, col), cell)
+            for the other cells within the radius
+        """
+        size = self.size
+        neighbors = []
+        for row in range(size):
+            for col in range(size):
+                cells = []
+                for i in range(max(row - radius, 0), min(row + radius, size - 1) + 1):
+                    for j in range(max(col - radius, 0), min(col + radius, size - 1) + 1):
+                        if (i, j) != (row, col):
+                            cells.append(((i, j), i * size + j))
+                neighbors.append(cells)
+        return neighbors
+        
+    
+    def build_symmetries(self) -> List[List[int]]:
+        """
+        Find how each rotation and reflection of the square board moves its cells.
+        
+        Returns:
+            The 8 symmetries of the board (identity first), each a list mapping
+            a flat cell index to the flat index of the cell it is moved to
+        """
+        size = self.size
+        symmetries = []
+        for reflect in (False, True):
+            for turns in range(4):
+                permutation = []
+                for row in range(size):
+                    for col in range(size):
+                        r, c = (row, size - 1 - col) if reflect else (row, col)
+                        for _ in range(turns):
+                            r, c = c, size - 1 - r  # Rotate a quarter turn clockwise
+                        permutation.append(r * size + c)
+                symmetries.append(permutation)
+        return symmetries
+
+
+    def canonical_moves(self, positions: List[Tuple]) -> List[Tuple]:
+        """
+        Drop moves that are mirror images of other moves. When the board looks the
+        same after a rotation or reflection, moves that map onto each other under
+        it lead to equivalent positions, so only one of them needs searching.
+        
+        Args:
+            positions: Candidate moves
+            
+        Returns:
+            The candidate moves with one move kept from each group of equivalent moves
+        """
+        size = self.size
+        grid = self.grid
+        occupied = [row * size + col for (row, col) in self.player_moves | self.computer_moves]
+        invariant = [permutation for permutation in self.symmetries[1:]
+                     if all(grid[permutation[cell]] == grid[cell] for cell in occupied)]
+        if not invariant:
+            return positions
+
+        seen = set()
+        canonical = []
+        for (row, col) in positions:
+            cell = row * size + col
+            key = min([cell] + [permutation[cell] for permutation in invariant])
+            if key not in seen:
+                seen.add(key)
+                canonical.append((row, col))
+        return canonical
         
     
     def player_turn(self) -> Tuple[int, int]:
@@ -137,7 +251,10 @@ class GeneralizedTicTacToe():
             Tuple of (row, col) representing the player's move
         """
         while True:
-            row, col = map(int, input("Enter row, col coordinates:").split())
+            try:
+                row, col = (int(value) for value in input("Enter row, col coordinates:").split())
+            except ValueError:
+                continue  # Not exactly two integers, ask again
             if self.is_valid_position(row, col):
                 break
         
@@ -145,12 +262,12 @@ class GeneralizedTicTacToe():
         return (row, col)
     
 
-    def place_symbol(self, symbol: str, position: Tuple, move_set: Set[Tuple]):
+    def place_symbol(self, symbol: int, position: Tuple, move_set: Set[Tuple]):
         """
         Place a symbol on the board and update the corresponding move set.
         
         Args:
-            symbol: The symbol to place ('X' or 'O')
+            symbol: The symbol to place (PLAYER or COMPUTER)
             position: (row, col) tuple where to place the symbol
             move_set: Set of moves to update (player_moves or computer_moves)
         """
@@ -158,7 +275,24 @@ class GeneralizedTicTacToe():
             print("ERROR: INVALID POSITION DETECTED")
             exit(1)
         move_set.add((position[0], position[1]))
-        self.grid[position[0]][position[1]] = symbol
+        cell = position[0] * self.size + position[1]
+        self.grid[cell] = symbol
+        self.empty_count -= 1
+        if symbol == self.PLAYER:
+            self.bb_player ^= 1 << cell
+            counts = self.line_p_count
+        else:
+            self.bb_comp ^= 1 << cell
+            counts = self.line_c_count
+        self.hash ^= self.zobrist[position[0]][position[1]][symbol - 1]
+        self.update_score(cell, counts, 1)
+
+        # The placed cell is no longer a candidate; its empty neighbours now are
+        frontier = self.frontier
+        frontier.pop((position[0], position[1]), None)
+        for neighbor, neighbor_cell in self.neighbors[cell]:
+            if self.grid[neighbor_cell] == 0:
+                frontier[neighbor] = frontier.get(neighbor, 0) + 1
 
     
     def remove_symbol(self, position: Tuple, move_set: Set[Tuple]):
@@ -170,109 +304,337 @@ class GeneralizedTicTacToe():
             move_set: Set of moves to update (player_moves or computer_moves)
         """
         move_set.remove((position[0], position[1]))
-        self.grid[position[0]][position[1]] = '-'
+        cell = position[0] * self.size + position[1]
+        symbol = self.grid[cell]
+        if symbol == self.PLAYER:
+            self.bb_player ^= 1 << cell
+            counts = self.line_p_count
+        else:
+            self.bb_comp ^= 1 << cell
+            counts = self.line_c_count
+        self.hash ^= self.zobrist[position[0]][position[1]][symbol - 1]
+        self.update_score(cell, counts, -1)
+        self.grid[cell] = 0
+        self.empty_count += 1
+
+        # Undo place_symbol's frontier update and re-add the emptied cell if a stone is still near it
+        frontier = self.frontier
+        count = 0
+        for neighbor, neighbor_cell in self.neighbors[cell]:
+            if self.grid[neighbor_cell] == 0:
+                if frontier[neighbor] == 1:
+                    del frontier[neighbor]
+                else:
+                    frontier[neighbor] -= 1
+            else:
+                count += 1
+        if count:
+            frontier[(position[0], position[1])] = count
+    
+    
+    def set_position(self, player_moves: Set[Tuple], computer_moves: Set[Tuple]):
+        """
+        Replace the board contents with the given moves.
+        
+        Args:
+            player_moves: Coordinates of the player's symbols
+            computer_moves: Coordinates of the computer's symbols
+        """
+        for move in list(self.player_moves):
+            self.remove_symbol(move, self.player_moves)
+        for move in list(self.computer_moves):
+            self.remove_symbol(move, self.computer_moves)
+        for move in player_moves:
+            self.place_symbol(self.PLAYER, move, self.player_moves)
+        for move in computer_moves:
+            self.place_symbol(self.COMPUTER, move, self.computer_moves)
+    
+
+    def update_score(self, cell: int, counts: bytearray, delta: int):
+        """
+        Update the symbol counts of every line through a cell, and the board score
+        and threat count with them.
+        
+        Args:
+            cell: Flat index (row * size + col) of the cell that changed
+            counts: line_p_count or line_c_count, for the side whose symbol changed
+            delta: 1 when a symbol is placed, -1 when it is removed
+        """
+        values = self.pattern_values
+        threats = self.threat_flags
+        stride = self.win_length + 1
+        p_count = self.line_p_count
+        c_count = self.line_c_count
+        step = delta * stride if counts is p_count else delta  # Change in table index per line
+        score = self.score
+        threat_count = self.threat_count
+        for i in self.lines_through[cell]:
+            index = p_count[i] * stride + c_count[i]
+            counts[i] += delta
+            score += values[index + step] - values[index]
+            threat_count += threats[index + step] - threats[index]
+        self.score = score
+        self.threat_count = threat_count
     
     
     def computer_turn(self) -> Tuple[int, int]:
         """
-        Determine the best move for the computer using alpha-beta pruning.
+        Determine the best move for the computer using iterative deepening
+        alpha-beta search. Each pass tries the previous pass's best move first,
+        and searches a narrow window around the score from two passes before
+        (scores alternate with the side that moves last, so that is the closer guess).
         
         Returns:
             Tuple of (row, col) representing the computer's move
         """
+        self.tt.clear()  # Entries from the previous turn were searched from a different root
+        self.killers = [[] for _ in range(self.search_depth + GeneralizedTicTacToe.MAX_EXTENSION + 1)]
+        window = 10 ** max(self.win_length - 2, 0)  # About one step of the exponential line scores
+        best_position = None
+        scores = []  # Score of each pass
+        for depth_limit in range(1, self.search_depth + 1):
+            alpha = -GeneralizedTicTacToe.MAX_VALUE
+            beta = GeneralizedTicTacToe.MAX_VALUE
+            if len(scores) >= 2 and abs(scores[-2]) < GeneralizedTicTacToe.MAX_VALUE:
+                alpha, beta = scores[-2] - window, scores[-2] + window
+            while True:
+                best_score, position = self.search(depth_limit, best_position, alpha, beta)
+                # If the score fell outside the window it is only a bound, so search again with that side opened
+                if best_score <= alpha and alpha > -GeneralizedTicTacToe.MAX_VALUE:
+                    alpha = -GeneralizedTicTacToe.MAX_VALUE
+                elif best_score >= beta and beta < GeneralizedTicTacToe.MAX_VALUE:
+                    beta = GeneralizedTicTacToe.MAX_VALUE
+                else:
+                    break
+            best_position = position
+            scores.append(best_score)
+        print(best_score)
+
+        self.place_symbol(self.COMPUTER, best_position, self.computer_moves)
+        return best_position
+
+
+    def search(self, depth_limit: int, pv_move: Tuple = None, alpha: int = -MAX_VALUE, beta: int = MAX_VALUE) -> Tuple[int, Tuple[int, int]]:
+        """
+        Search every candidate computer move to a fixed depth.
+        
+        Args:
+            depth_limit: Depth at which positions are scored heuristically
+            pv_move: Best move from the previous iteration, searched first
+            alpha: Alpha value for pruning (a score at or below it stops the search)
+            beta: Beta value for pruning
+            
+        Returns:
+            Tuple of (best score, best move) for the computer
+        """
+        self.depth_limit = depth_limit
         best_position = (-1, -1)
         best_score = GeneralizedTicTacToe.MAX_VALUE ** 2  # Initialize with a very high score (worse for computer)
-        positions = self.get_nearby_positions()
-        for position in positions:
+        positions = self.canonical_moves(self.get_nearby_positions())
+        for position in self.order_positions(positions, 0, False, pv_move):
             self.place_symbol(self.COMPUTER, position, self.computer_moves)
-            # Get score from alpha-beta search (lower is better for computer)
-            score = self.alpha_beta(True, 1, -GeneralizedTicTacToe.MAX_VALUE, GeneralizedTicTacToe.MAX_VALUE, position)
+            # Only scores below the best found so far matter, so narrow beta to it
+            score = self.alpha_beta(True, 1, alpha, min(best_score, beta), position)
             self.remove_symbol(position, self.computer_moves)
-            print(score)
-            if score <= best_score:  # Computer is minimizing, so lower scores are better
+            if score < best_score:  # Computer is minimizing, so lower scores are better
                 best_score = score
                 best_position = (position[0], position[1])
+            if best_score <= alpha:  # Fail low: the score is at most alpha
+                break
 
-        self.place_symbol(self.COMPUTER, best_position, self.computer_moves)
-        return best_position    
+        return best_score, best_position
 
 
-    def alpha_beta(self, is_maximizing: bool, depth: int, alpha: int, beta: int, last_move: Tuple) -> int:
+    def order_positions(self, positions: List[Tuple], depth: int, is_maximizing: bool, pv_move: Tuple) -> List[Tuple]:
         """
-        Alpha-beta pruning algorithm to evaluate the best move.
+        Order candidate moves so the ones most likely to cause a cutoff are searched first:
+        the PV move, then the killer moves for this depth, then the rest by threat score,
+        with ties broken by history score.
         
         Args:
-            is_maximizing: True if maximizing player's turn (player), False if minimizing (computer)
+            positions: Candidate moves
             depth: Current search depth
-            alpha: Alpha value for pruning
-            beta: Beta value for pruning
-            last_move: Last move made (used for victory checking)
+            is_maximizing: True if the player is to move, False if the computer is
+            pv_move: Best move known for this position (from a previous search), or None
             
         Returns:
-            Evaluation score of the position
+            The candidate moves in search order
         """
-        # First check if the position is terminal (win/loss/draw) or max depth reached
-        evaluation = self.evaluate_position(depth, is_maximizing, last_move)
-        if evaluation != GeneralizedTicTacToe.CONTINUE:
-            return evaluation
-        
-        if is_maximizing == True:
-            return self.maximize(depth, last_move, alpha, beta)
-        
-        return self.minimize(depth, last_move, alpha, beta)
-    
+        first = [pv_move] if pv_move in positions else []
+        for move in self.killers[depth]:
+            if move in positions and move not in first:
+                first.append(move)
+        rest = [position for position in positions if position not in first]
+
+        # Threat score of a move: how much it extends our lines or blocks the opponent's
+        weights = self.threat_weights[is_maximizing]
+        stride = self.win_length + 1
+        p_count = self.line_p_count
+        c_count = self.line_c_count
+        lines_through = self.lines_through
+        size = self.size
+        history = self.history
+        keys = {}
+        for position in rest:
+            score = 0
+            for i in lines_through[position[0] * size + position[1]]:
+                score += weights[p_count[i] * stride + c_count[i]]
+            keys[position] = (score, history.get(position, 0))
+        rest.sort(key=keys.__getitem__, reverse=True)
+        return first + rest
 
-    def maximize(self, depth: int, last_move: Tuple, alpha: int, beta: int):
+
+    def record_cutoff(self, position: Tuple, depth: int):
         """
-        Maximizing part of alpha-beta pruning (player's turn in search).
+        Remember a move that caused a cutoff so it is tried early in sibling positions.
         
         Args:
-            depth: Current search depth
-            last_move: Last move made
-            alpha: Alpha value for pruning
-            beta: Beta value for pruning
-            
-        Returns:
-            Best score for maximizing player
+            position: The move that caused the cutoff
+            depth: Search depth at which the cutoff happened
         """
-        best_val = -GeneralizedTicTacToe.MAX_VALUE
-        for position in self.get_nearby_positions():
-            self.place_symbol(self.PLAYER, position, self.player_moves)
-            val = self.alpha_beta(False, depth + 1, alpha, beta, position)
-            self.remove_symbol(position, self.player_moves)
+        killers = self.killers[depth]
+        if not killers:
+            self.killers[depth] = [position]
+        elif killers[0] != position:
+            self.killers[depth] = [position, killers[0]]
+        # Cutoffs close to the root prune larger subtrees, so they weigh more
+        self.history[position] = self.history.get(position, 0) + (1 << max(self.search_depth - depth, 0))
 
-            best_val = max(best_val, val)
-            alpha = max(alpha, val)
-            if alpha >= beta:  # Beta cutoff
-                break
-        
-        return best_val
-    
-    def minimize(self, depth: int, last_move: Tuple, alpha: int, beta: int):
+
+    def alpha_beta(self, is_maximizing: bool, depth: int, alpha: int, beta: int, last_move: Tuple) -> int:
         """
-        Minimizing part of alpha-beta pruning (computer's turn in search).
+        Alpha-beta pruning algorithm to evaluate the best move.
+        The search runs on an explicit stack of frames rather than recursing,
+        to avoid the cost of a Python call per node.
         
         Args:
+            is_maximizing: True if maximizing player's turn (player), False if minimizing (computer)
             depth: Current search depth
-            last_move: Last move made
             alpha: Alpha value for pruning
             beta: Beta value for pruning
+            last_move: Last move made (used for victory checking)
             
         Returns:
-            Best score for minimizing player
+            Evaluation score of the position
         """
-        best_val = GeneralizedTicTacToe.MAX_VALUE
-        for position in self.get_nearby_positions():
-            self.place_symbol(self.COMPUTER, position, self.computer_moves)
-            val = self.alpha_beta(True, depth + 1, alpha, beta, position)
-            self.remove_symbol(position, self.computer_moves)
+        # Bind everything the loop uses to locals once, rather than looking it up at every node
+        evaluate_position = self.evaluate_position
+        get_nearby_positions = self.get_nearby_positions
+        order_positions = self.order_positions
+        place_symbol = self.place_symbol
+        remove_symbol = self.remove_symbol
+        record_cutoff = self.record_cutoff
+        player_moves = self.player_moves
+        computer_moves = self.computer_moves
+        PLAYER = self.PLAYER
+        COMPUTER = self.COMPUTER
+        tt = self.tt
+        depth_limit = self.depth_limit
+        CONTINUE = GeneralizedTicTacToe.CONTINUE
+        MAX_VALUE = GeneralizedTicTacToe.MAX_VALUE
+        EXACT = GeneralizedTicTacToe.EXACT
+        LOWER = GeneralizedTicTacToe.LOWER
+        UPPER = GeneralizedTicTacToe.UPPER
+        NULL_MOVE_KEY = GeneralizedTicTacToe.NULL_MOVE_KEY
+        NULL_MOVE_REDUCTION = GeneralizedTicTacToe.NULL_MOVE_REDUCTION
+
+        # Each frame is [is_maximizing, depth, alpha, beta, alpha_orig, beta_orig, moves, next_index, best_val, best_move]
+        stack = []
+        child = (is_maximizing, depth, alpha, beta, last_move)  # Node to visit next
+        value = None  # Score of the node that just finished, to fold into its parent
+        while True:
+            if child is not None:
+                # First visit: check if the position is terminal (win/loss/draw) or max depth reached
+                is_maximizing, depth, alpha, beta, last_move = child
+                child = None
+                value = evaluate_position(depth, is_maximizing, last_move)
+                if value == CONTINUE:
+                    value = None
+
+                    # Probe the transposition table for a result from a transposed move order
+                    alpha_orig, beta_orig = alpha, beta
+                    pv_move = None
+                    entry = tt.get(self.hash)
+                    if entry is not None:
+                        entry_depth, flag, entry_value, pv_move = entry  # Best move from an earlier search is tried first
+                        if entry_depth >= depth_limit - depth:
+                            if flag == EXACT:
+                                value = entry_value
+                            elif flag == LOWER:
+                                alpha = max(alpha, entry_value)
+                            elif flag == UPPER:
+                                beta = min(beta, entry_value)
+                            if alpha >= beta:
+                                value = entry_value
+
+                    # Null move: if passing still fails high (low for the computer), a real move would too.
+                    # In this game an extra symbol never hurts, so passing is never better than moving.
+                    # Skipped near the horizon and while a win is threatened.
+                    if value is None and depth + NULL_MOVE_REDUCTION < depth_limit and not self.threat_count:
+                        if is_maximizing and beta < MAX_VALUE:
+                            self.hash ^= NULL_MOVE_KEY
+                            if self.alpha_beta(False, depth + NULL_MOVE_REDUCTION + 1, beta - 1, beta, last_move) >= beta:
+                                value = beta
+                            self.hash ^= NULL_MOVE_KEY
+                        elif not is_maximizing and alpha > -MAX_VALUE:
+                            self.hash ^= NULL_MOVE_KEY
+                            if self.alpha_beta(True, depth + NULL_MOVE_REDUCTION + 1, alpha, alpha + 1, last_move) <= alpha:
+                                value = alpha
+                            self.hash ^= NULL_MOVE_KEY
+
+                    if value is None:
+                        moves = order_positions(get_nearby_positions(), depth, is_maximizing, pv_move)
+                        best_val = -MAX_VALUE if is_maximizing else MAX_VALUE
+                        stack.append([is_maximizing, depth, alpha, beta, alpha_orig, beta_orig, moves, 0, best_val, None])
+
+            if not stack:
+                return value
+
+            frame = stack[-1]
+            is_maximizing, depth, alpha, beta, alpha_orig, beta_orig, moves, index, best_val, best_move = frame
+            if value is not None:
+                # A child just finished: undo its move and fold its score in
+                position = moves[index - 1]
+                if is_maximizing:
+                    remove_symbol(position, player_moves)
+                    if best_move is None or value > best_val:
+                        best_move = position
+                    best_val = max(best_val, value)
+                    alpha = max(alpha, value)
+                else:
+                    remove_symbol(position, computer_moves)
+                    if best_move is None or value < best_val:
+                        best_move = position
+                    best_val = min(best_val, value)
+                    beta = min(beta, value)
+                value = None
+                if alpha >= beta:  # Cutoff, skip the remaining moves
+                    record_cutoff(position, depth)
+                    index = len(moves)
+                frame[2], frame[3], frame[7], frame[8], frame[9] = alpha, beta, index, best_val, best_move
+
+            if index < len(moves):
+                # Descend into the next move
+                position = moves[index]
+                frame[7] = index + 1
+                if is_maximizing:
+                    place_symbol(PLAYER, position, player_moves)
+                else:
+                    place_symbol(COMPUTER, position, computer_moves)
+                child = (not is_maximizing, depth + 1, alpha, beta, position)
+            else:
+                # All moves searched: store the result along with whether it is exact or only a bound
+                stack.pop()
+                if depth < depth_limit:  # Nodes past the horizon were only searched by the threat extension
+                    if best_val <= alpha_orig:
+                        flag = UPPER
+                    elif best_val >= beta_orig:
+                        flag = LOWER
+                    else:
+                        flag = EXACT
+                    tt[self.hash] = (depth_limit - depth, flag, best_val, best_move)
+                value = best_val
 
-            best_val = min(best_val, val)
-            beta = min(beta, val)
-            if alpha >= beta:  # Alpha cutoff
-                break
-        
-        return best_val
 
     def evaluate_position(self, depth: int, is_maximizing: bool, last_move: Tuple):
         """
@@ -281,19 +643,25 @@ class GeneralizedTicTacToe():
         Args:
             depth: Current search depth
             is_maximizing: True if maximizing player's turn, False otherwise
-            last_move: Last move made (used for victory checking)
+            last_move: Last move made
             
         Returns:
             Evaluation score or CONTINUE flag if search should continue
         """
+        # Faster wins score higher; the extension keeps the multiplier positive past the horizon
+        win_score = GeneralizedTicTacToe.MAX_VALUE * (self.depth_limit + GeneralizedTicTacToe.MAX_EXTENSION + 1 - depth)
+
         # Check if someone won with the last move
-        if is_maximizing == True and self.check_victory(self.computer_moves, last_move):
-            return -1 * GeneralizedTicTacToe.MAX_VALUE * (self.search_depth - depth)  # Computer wins
-        if is_maximizing == False and self.check_victory(self.player_moves, last_move):
-            return 1 * GeneralizedTicTacToe.MAX_VALUE * (self.search_depth - depth)   # Player wins
-        if len(self.get_empty_positions()) == 0:
+        if is_maximizing == True and self.check_victory_bb(self.bb_comp):
+            return -1 * win_score  # Computer wins
+        if is_maximizing == False and self.check_victory_bb(self.bb_player):
+            return 1 * win_score   # Player wins
+        if self.empty_count == 0:
             return 0  # Draw
-        if depth == self.search_depth:
+        if depth >= self.depth_limit:
+            # If either side is one move from a win, search on so the win isn't hidden past the horizon
+            if self.threat_count and depth < self.depth_limit + GeneralizedTicTacToe.MAX_EXTENSION:
+                return GeneralizedTicTacToe.CONTINUE
             result = self.position_score(depth)  # Heuristic evaluation at max depth
             return result
         return GeneralizedTicTacToe.CONTINUE  # Continue search
@@ -301,7 +669,8 @@ class GeneralizedTicTacToe():
 
     def position_score(self, depth: int):
         """
-        Calculate a heuristic score for a non-terminal position.
+        Get the heuristic score for a non-terminal position.
+        The score is maintained incrementally by place_symbol/remove_symbol.
         
         Args:
             depth: Current search depth
@@ -309,148 +678,93 @@ class GeneralizedTicTacToe():
         Returns:
             A score estimating the value of the current position
         """
-        total_score = 0
-        
-        # Find all possible winning patterns on the board
-        patterns = self.find_all_patterns(self.grid, self.win_length)
-        
-        # Evaluate each pattern and sum up the scores
-        for pattern in patterns:
-            total_score += self.evaluate_pattern(pattern, depth)
-
-        return total_score
+        return self.score
             
 
-    def find_all_patterns(self, grid, win_length):
+    def build_line_masks(self) -> Tuple[Tuple[int, ...], List[Tuple[int, ...]]]:
         """
-        Find all possible winning line patterns on the board.
-        
-        Args:
-            grid: Current game grid
-            win_length: Number of consecutive symbols needed to win
+        Find all possible winning lines on the board. This only depends on the
+        board size and win length, so it is done once when the game is created.
             
         Returns:
-            List of all possible line patterns (horizontal, vertical, diagonal)
+            Tuple of (bitmask of each line (horizontal, vertical, diagonal),
+            list indexed by flat cell index (row * size + col) of the indices of the lines through that cell)
         """
         size = self.size
-        patterns = []
+        win_length = self.win_length
+        masks = []
+        lines_through = [[] for _ in range(size * size)]
 
         if win_length > size:
-            return patterns
-
-        # Horizontal patterns
-        for i in range(size):
-            for j in range(size - win_length + 1):
-                patterns.append([grid[i][j + k] for k in range(win_length)])
+            return tuple(masks), [tuple(lines) for lines in lines_through]
 
-        # Vertical patterns
-        for j in range(size):
-            for i in range(size - win_length + 1):
-                patterns.append([grid[i + k][j] for k in range(win_length)])
-
-        # Diagonal patterns (top-left to bottom-right)
-        for i in range(size - win_length + 1):
-            for j in range(size - win_length + 1):
-                patterns.append([grid[i + k][j + k] for k in range(win_length)])
-
-        # Diagonal patterns (top-right to bottom-left)
-        for i in range(size - win_length + 1):
-            for j in range(win_length - 1, size):
-                patterns.append([grid[i + k][j - k] for k in range(win_length)])
-
-        return patterns
+        starts = range(size - win_length + 1)  # Rows/columns where a line fits
+        directions = [
+            (0, 1, range(size), starts),                      # Horizontal
+            (1, 0, starts, range(size)),                      # Vertical
+            (1, 1, starts, starts),                           # Diagonal (top-left to bottom-right)
+            (1, -1, starts, range(win_length - 1, size)),     # Diagonal (top-right to bottom-left)
+        ]
+        for dr, dc, rows, cols in directions:
+            for i in rows:
+                for j in cols:
+                    mask = 0
+                    for k in range(win_length):
+                        row, col = i + k * dr, j + k * dc
+                        mask |= 1 << (row * size + col)
+                        lines_through[row * size + col].append(len(masks))
+                    masks.append(mask)
 
+        return tuple(masks), [tuple(lines) for lines in lines_through]
     
-    def evaluate_pattern(self, pattern, depth):
+
+    def build_win_shifts(self) -> List[Tuple[int, int]]:
         """
-        Evaluate a single pattern for its potential value.
+        Precompute what check_victory_bb needs for each line direction.
         
-        Args:
-            pattern: List of symbols to evaluate
-            depth: Current search depth
-            
         Returns:
-            Score for this pattern
+            List of (shift, start_mask) tuples for horizontal, vertical and both
+            diagonal lines, where shift is the bit distance between neighbouring
+            cells of a line and start_mask has a bit set for every cell a whole
+            line can start from without running off the board
         """
-        symbol_count = self.count_symbols(pattern)
-        computer_count = symbol_count.get(self.COMPUTER, 0)
-        player_count = symbol_count.get(self.PLAYER, 0)
-
-        # Check for winning patterns
-        if computer_count == self.win_length:
-            return -GeneralizedTicTacToe.MAX_VALUE * (self.search_depth - depth)  # Computer wins
-        
-        if player_count == self.win_length:
-            return GeneralizedTicTacToe.MAX_VALUE * (self.search_depth - depth)   # Player wins
-
-        # Evaluate pattern potential
-        if computer_count > 0 and player_count > 0:
-            return 0  # Mixed symbols, no potential
-        elif player_count > 0:
-            return 10 ** player_count  # Player potential (exponential scoring)
-        elif computer_count > 0:
-            return -1 * (10 ** computer_count)  # Computer potential (negative)
-        return 0  # Empty pattern
-
+        size = self.size
+        win_length = self.win_length
+        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]  # horizontal, vertical, diagonal down, diagonal up
 
+        win_shifts = []
+        for (dr, dc) in directions:
+            start_mask = 0
+            for row in range(size):
+                for col in range(size):
+                    end_row = row + (win_length - 1) * dr
+                    end_col = col + (win_length - 1) * dc
+                    if 0 <= end_row < size and 0 <= end_col < size:
+                        start_mask |= 1 << (row * size + col)
+            win_shifts.append((dr * size + dc, start_mask))
+        return win_shifts
 
-    def count_symbols(self, pattern):
-        """
-        Count occurrences of each symbol in a pattern.
-        
-        Args:
-            pattern: List of symbols
-            
-        Returns:
-            Dictionary with count of each symbol
-        """
-        counts = {}
-        for symbol in pattern:
-            if symbol in counts:
-                counts[symbol] += 1
-            else:
-                counts[symbol] = 1
-        return counts
-    
 
-    
-    def check_victory(self, moves: Set[Tuple], last_move: Tuple) -> bool:
+    def check_victory_bb(self, bb: int) -> bool:
         """
-        Check if the last move created a winning line.
+        Check if a side has a winning line, using shifts and ANDs on its bitboard:
+        a line starts at a cell if the cell and the win_length - 1 cells after it
+        (shift bits apart) are all set.
         
         Args:
-            moves: Set of moves to check within
-            last_move: Last move made
+            bb: Bitboard of the side to check (bb_player or bb_comp)
             
         Returns:
-            True if the last move created a winning line, False otherwise
+            True if the side has win_length symbols in a row, False otherwise
         """
-        if last_move == (-1, -1):
-            return False
-
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]  # horizontal, vertical, diagonal down, diagonal up
-
-        for (dr, dc) in directions:
-            count = 1  # Start with 1 for the last move
-            # Check forward direction
-            for step in range(1, self.win_length):
-                new_row = last_move[0] + step * dr
-                new_col = last_move[1] + step * dc
-                if (new_row, new_col) not in moves:
-                    break
-                count += 1
-            
-            # Check backward direction
+        for shift, start_mask in self.win_shifts:
+            lines = bb & start_mask
             for step in range(1, self.win_length):
-                new_row = last_move[0] - step * dr
-                new_col = last_move[1] - step * dc
-                if (new_row, new_col) not in moves:
+                if not lines:
                     break
-                count += 1
-
-            if count >= self.win_length:
+                lines &= bb >> (step * shift)
+            if lines:
                 return True
-
         return False
     
     
@@ -463,19 +777,19 @@ class GeneralizedTicTacToe():
         while True:
             self.display_grid()
             move = self.player_turn()
-            if self.check_victory(self.player_moves, move):
+            if self.check_victory_bb(self.bb_player):
                 print('Player wins!')
                 break
             
-            if len(self.get_empty_positions()) == 0:
+            if self.empty_count == 0:
                 print('Game ends in a draw')
                 break
 
             move = computer_move_parallel(self)  # Use parallel processing to improve AI performance
-            if self.check_victory(self.computer_moves, move):
+            if self.check_victory_bb(self.bb_comp):
                 print('Computer wins!')
                 break
-            if len(self.get_empty_positions()) == 0:
+            if self.empty_count == 0:
                 print('Game ends in a draw')
                 break
 
@@ -486,6 +800,28 @@ class GeneralizedTicTacToe():
         return
     
 
+    def wait_for_opponent_move(self, game_id, move_id) -> Tuple[int, int]:
+        """
+        Poll the server until the online opponent has made a move, backing off
+        between polls so the server isn't flooded with requests.
+        
+        Args:
+            game_id: Game ID
+            move_id: ID of our last move; any other latest move is the opponent's
+            
+        Returns:
+            Tuple of (row, col) representing the opponent's move
+        """
+        delay = GeneralizedTicTacToe.POLL_DELAY_MIN
+        while True:
+            response = api.get_moves(game_id, "1")
+            if response['moveId'] != move_id:
+                row, col = map(int, response['move'].split(','))
+                return (row, col)
+            time.sleep(delay)
+            delay = min(delay * 2, GeneralizedTicTacToe.POLL_DELAY_MAX)
+
+
     def play_computer_vs_online(self, team_id1, team_id2):
         """
         Play a game where this computer AI plays against an online opponent.
@@ -503,19 +839,14 @@ class GeneralizedTicTacToe():
         while True:
             self.display_grid()
             # Wait for opponent's move
-            while True:
-                response = api.get_moves(game_id, "1") 
-                if response['moveId'] != move_id:
-                    row, col = map(int, response['move'].split(','))
-                    move = (row, col)
-                    self.place_symbol(self.PLAYER, move, self.player_moves)
-                    break
+            move = self.wait_for_opponent_move(game_id, move_id)
+            self.place_symbol(self.PLAYER, move, self.player_moves)
             
-            if self.check_victory(self.player_moves, move):
+            if self.check_victory_bb(self.bb_player):
                 print('Opponent wins!')
                 break
 
-            if len(self.get_empty_positions()) == 0:
+            if self.empty_count == 0:
                 print('Game ends in a draw')
                 break
             
@@ -524,11 +855,11 @@ class GeneralizedTicTacToe():
             move = self.computer_turn()
             move_id = api.make_move(game_id, team_id1, f"{move[0]},{move[1]}")
 
-            if self.check_victory(self.computer_moves, move):
+            if self.check_victory_bb(self.bb_comp):
                 print('You win!')
                 break
 
-            if len(self.get_empty_positions()) == 0:
+            if self.empty_count == 0:
                 print('Game ends in a draw')
                 break
 
@@ -561,29 +892,24 @@ class GeneralizedTicTacToe():
             move = self.computer_turn()
             move_id = api.make_move(game_id, team_id, f"{move[0]},{move[1]}")
 
-            if self.check_victory(self.computer_moves, move):
+            if self.check_victory_bb(self.bb_comp):
                 print('Computer wins!')
                 break
 
-            if len(self.get_empty_positions()) == 0:
+            if self.empty_count == 0:
                 print('Game ends in a draw')
                 break
 
             # Wait for opponent's move
             self.display_grid()
-            while True:
-                response = api.get_moves(game_id, "1") 
-                if response['moveId'] != move_id:
-                    row, col = map(int, response['move'].split(','))
-                    move = (row, col)
-                    self.place_symbol(self.PLAYER, move, self.player_moves)
-                    break
+            move = self.wait_for_opponent_move(game_id, move_id)
+            self.place_symbol(self.PLAYER, move, self.player_moves)
             
-            if self.check_victory(self.player_moves, move):
+            if self.check_victory_bb(self.bb_player):
                 print('Opponent wins!')
                 break
 
-            if len(self.get_empty_positions()) == 0:
+            if self.empty_count == 0:
                 print('Game ends in a draw')
                 break
         
@@ -593,27 +919,96 @@ class GeneralizedTicTacToe():
 
         
         
-def computer_move_worker(args):
+# Persistent worker pool and shared transposition table for computer_move_parallel,
+# created on first use and reused for every later move of a game with the same settings
+_executor = None
+_executor_settings = None
+_shared_tt = None
+
+# Per-process game used by the workers, created by init_worker
+_worker_game = None
+
+
+def init_worker(size: int, win_length: int, search_depth: int, tt_name: str):
+    """
+    Set up a worker process with its own game that uses the shared transposition table.
+    
+    Args:
+        size: The dimension of the board
+        win_length: Number of consecutive symbols needed to win
+        search_depth: Maximum depth for alpha-beta search
+        tt_name: Name of the shared memory block holding the transposition table
+    """
+    global _worker_game
+    _worker_game = GeneralizedTicTacToe(size, win_length)
+    _worker_game.search_depth = search_depth
+    _worker_game.depth_limit = search_depth
+    _worker_game.killers = [[] for _ in range(search_depth + GeneralizedTicTacToe.MAX_EXTENSION + 1)]
+    _worker_game.tt = SharedTranspositionTable(size, name=tt_name)
+
+
+def computer_move_worker(player_moves: Set[Tuple], computer_moves: Set[Tuple], position: Tuple, alpha: int, beta: int) -> Tuple[int, Tuple]:
     """
     Worker function for parallel processing of computer moves.
     
     Args:
-        args: Tuple containing (game, position)
+        player_moves: Coordinates of the player's symbols
+        computer_moves: Coordinates of the computer's symbols
+        position: Computer move to evaluate
+        alpha: Alpha value for pruning
+        beta: Beta value for pruning
         
     Returns:
         Tuple of (score, position)
     """
-    game: GeneralizedTicTacToe = args[0]
-    position = args[1]
+    game = _worker_game
+    game.set_position(player_moves, computer_moves)
     game.place_symbol(game.COMPUTER, position, game.computer_moves)
-    score = game.alpha_beta(True, 1, -GeneralizedTicTacToe.MAX_VALUE, GeneralizedTicTacToe.MAX_VALUE, position)
+    score = game.alpha_beta(True, 1, alpha, beta, position)
     game.remove_symbol(position, game.computer_moves)
     return (score, position)
 
 
+def get_executor(game: GeneralizedTicTacToe) -> Tuple[ProcessPoolExecutor, SharedTranspositionTable]:
+    """
+    Get the worker pool and shared transposition table for a game, creating them if needed.
+    
+    Args:
+        game: Current game instance
+        
+    Returns:
+        Tuple of (worker pool, shared transposition table)
+    """
+    global _executor, _executor_settings, _shared_tt
+    settings = (game.size, game.win_length, game.search_depth)
+    if _executor_settings != settings:
+        shutdown_executor()
+        _shared_tt = SharedTranspositionTable(game.size)
+        _executor = ProcessPoolExecutor(max_workers=cpu_count(), initializer=init_worker,
+                                        initargs=settings + (_shared_tt.name,))
+        _executor_settings = settings
+    return _executor, _shared_tt
+
+
+@atexit.register
+def shutdown_executor():
+    """
+    Stop the worker pool and free the shared transposition table.
+    """
+    global _executor, _executor_settings, _shared_tt
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _shared_tt.close(unlink=True)
+    _executor = None
+    _executor_settings = None
+    _shared_tt = None
+
+
 def computer_move_parallel(game: GeneralizedTicTacToe):
     """
     Use parallel processing to evaluate all possible computer moves.
+    The most promising move is searched first to get a bound, and the
+    remaining moves are then searched in parallel inside that bound.
     
     Args:
         game: Current game instance
@@ -621,19 +1016,35 @@ def computer_move_parallel(game: GeneralizedTicTacToe):
     Returns:
         Best move position as (row, col) tuple
     """
-    positions = game.get_nearby_positions()
-    
-    # Create a process pool to evaluate positions in parallel
-    with Pool(processes=cpu_count()) as pool:
-        results = pool.map(computer_move_worker, [(game, position) for position in positions])
-
-    # Find the best move (lowest score for computer)
-    best_position = (-1, -1)
-    best_score = GeneralizedTicTacToe.MAX_VALUE ** 2
-    for result in results:
-        score, position = result
-        if score <= best_score:
+    executor, tt = get_executor(game)
+    tt.clear()  # Entries from the previous turn were searched from a different root
+
+    # Order moves by static score (lowest is best for computer)
+    static_scores = {}
+    for position in game.canonical_moves(game.get_nearby_positions()):
+        game.place_symbol(game.COMPUTER, position, game.computer_moves)
+        static_scores[position] = game.score
+        game.remove_symbol(position, game.computer_moves)
+    positions = sorted(static_scores, key=static_scores.get)
+
+    # Search the most promising move fully to get a real bound for the others
+    player_moves, computer_moves = set(game.player_moves), set(game.computer_moves)
+    best_score, best_position = executor.submit(computer_move_worker, player_moves, computer_moves, positions[0],
+                                                -GeneralizedTicTacToe.MAX_VALUE, GeneralizedTicTacToe.MAX_VALUE).result()
+
+    # Only scores below the bound matter for the remaining moves
+    beta = min(best_score, GeneralizedTicTacToe.MAX_VALUE)
+    futures = [executor.submit(computer_move_worker, player_moves, computer_moves, position,
+                               -GeneralizedTicTacToe.MAX_VALUE, beta) for position in positions[1:]]
+    for future in as_completed(futures):
+        score, position = future.result()
+        if score < best_score:
             best_score = score
             best_position = (position[0], position[1])
+        if best_score <= -GeneralizedTicTacToe.MAX_VALUE:  # Forced win found, no need to look further
+            for pending in futures:
+                pending.cancel()
+            break
+
     game.place_symbol(game.COMPUTER, best_position, game.computer_moves)
     return best_position
@@ -1,7 +1,8 @@
 import http.client
-import ast
+import json
 
 # API endpoint and authentication details
+host = "www.notexponential.com"
 url = "/aip2pgaming/api/index.php"
 id = '3679'
 key = '3765d74d8c9c37475a69'
@@ -11,9 +12,38 @@ headers = {
   'userId': id,
   'x-api-key': key,
   'Content-Type': 'application/x-www-form-urlencoded',
-  'Cookie': 'humans_21909=1'
+  'Cookie': 'humans_21909=1',
+  'Accept': 'application/json'
 }
 
+# Connection reused across requests so the TLS handshake is only done once
+conn = None
+
+def send_request(method: str, path: str, body: str) -> str:
+    """
+    Send a request over the shared connection, reconnecting once if the server closed it.
+    
+    Args:
+        method: HTTP method
+        path: Request path, including any query string
+        body: Request body, or None
+        
+    Returns:
+        The response body
+    """
+    global conn
+    for attempt in range(2):
+        if conn is None:
+            conn = http.client.HTTPSConnection(host)
+        try:
+            conn.request(method, path, body, headers)
+            return conn.getresponse().read().decode()
+        except (http.client.HTTPException, ConnectionError):
+            conn.close()
+            conn = None
+            if attempt == 1:
+                raise
+
 def make_post_request(parameters: str) -> str:
     """
     Make a POST request to the API.
@@ -24,11 +54,8 @@ def make_post_request(parameters: str) -> str:
     Returns:
         Dictionary containing the API response
     """
-    conn = http.client.HTTPSConnection("www.notexponential.com")
-    conn.request("POST", url, parameters, headers)
-    response = conn.getresponse()
-    data = response.read().decode()
-    return ast.literal_eval(data)  # Convert JSON string to Python dictionary
+    data = send_request("POST", url, parameters)
+    return json.loads(data)  # Convert JSON string to Python dictionary
 
 def make_get_request(parameters: str) -> str:
     """
@@ -40,12 +67,9 @@ def make_get_request(parameters: str) -> str:
     Returns:
         Dictionary containing the API response
     """
-    conn = http.client.HTTPSConnection("www.notexponential.com")
     full_path = url + "?" + parameters
-    conn.request("GET", full_path, None, headers)
-    response = conn.getresponse()
-    data = response.read().decode()
-    return ast.literal_eval(data)  # Convert JSON string to Python dictionary
+    data = send_request("GET", full_path, None)
+    return json.loads(data)  # Convert JSON string to Python dictionary
 
 
 def create_team(tname: str) -> dict:
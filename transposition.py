@@ -0,0 +1,105 @@
+from typing import Tuple
+from multiprocessing import shared_memory
+
+class SharedTranspositionTable():
+    """
+    A fixed-size transposition table kept in shared memory, so that the worker
+    processes of a parallel search can reuse each other's results.
+
+    It supports the same get/store/clear operations as the dict used for
+    GeneralizedTicTacToe.tt, so a game can use either one. Each slot holds two
+    64-bit words: (key ^ data, data). No locks are taken; if two processes write
+    the same slot at once, the xor check fails and the slot reads as a miss
+    rather than returning another position's entry.
+    """
+
+    # Packed entry layout (low to high bits): move + 1, flag, depth, value + VALUE_BIAS
+    MOVE_BITS = 14
+    FLAG_BITS = 2
+    DEPTH_BITS = 8
+    VALUE_BIAS = 1 << 39  # Values are stored unsigned in the remaining 40 bits
+
+    def __init__(self, size: int, entries: int = 1 << 20, name: str = None):
+        """
+        Create a new table, or attach to one created by another process.
+
+        Args:
+            size: The dimension of the game board (used to pack moves)
+            entries: Number of slots in the table
+            name: Shared memory block to attach to, or None to create one
+        """
+        self.size = size
+        self.entries = entries
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=entries * 16)
+            self.shm.buf[:] = bytes(entries * 16)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.slots = self.shm.buf.cast('Q')  # Two unsigned 64-bit words per slot
+
+
+    def get(self, key: int) -> Tuple:
+        """
+        Look up a position.
+
+        Args:
+            key: Zobrist hash of the position
+
+        Returns:
+            Tuple of (depth, flag, value, best_move), or None if the position is not stored
+        """
+        index = (key % self.entries) * 2
+        data = self.slots[index + 1]
+        if data == 0 or self.slots[index] ^ data != key:
+            return None
+
+        move = data & ((1 << self.MOVE_BITS) - 1)
+        data >>= self.MOVE_BITS
+        flag = data & ((1 << self.FLAG_BITS) - 1)
+        data >>= self.FLAG_BITS
+        depth = data & ((1 << self.DEPTH_BITS) - 1)
+        value = (data >> self.DEPTH_BITS) - self.VALUE_BIAS
+        best_move = None if move == 0 else divmod(move - 1, self.size)
+        return (depth, flag, value, best_move)
+
+
+    def __setitem__(self, key: int, entry: Tuple):
+        """
+        Store a position, replacing whatever was in its slot.
+
+        Args:
+            key: Zobrist hash of the position
+            entry: Tuple of (depth, flag, value, best_move)
+        """
+        depth, flag, value, best_move = entry
+        move = 0 if best_move is None else best_move[0] * self.size + best_move[1] + 1
+        depth = max(0, min(depth, (1 << self.DEPTH_BITS) - 1))
+        data = value + self.VALUE_BIAS
+        data = (data << self.DEPTH_BITS) | depth
+        data = (data << self.FLAG_BITS) | flag
+        data = (data << self.MOVE_BITS) | move
+
+        index = (key % self.entries) * 2
+        self.slots[index] = key ^ data
+        self.slots[index + 1] = data
+
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        self.shm.buf[:] = bytes(self.entries * 16)
+
+
+    def close(self, unlink: bool = False):
+        """
+        Detach from the shared memory block.
+
+        Args:
+            unlink: Also free the block (only the creating process should do this)
+        """
+        self.slots.release()
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()